@@ -13,11 +13,12 @@ This module contains base classes and helper functions for defining Pratt parser
 import sys
 import re
 from abc import ABCMeta
+from bisect import bisect_left
 from unicodedata import name as unicode_name
 from decimal import Decimal, DecimalException
-from typing import Any, cast, overload, Callable, Dict, Generic, List, \
+from typing import Any, cast, overload, Callable, Dict, FrozenSet, Generic, List, \
     Optional, Union, Tuple, Type, Pattern, Match, MutableMapping, \
-    MutableSequence, Iterator, TypeVar
+    MutableSequence, Iterable, Iterator, TypeVar
 
 #
 # Simple top-down parser based on Vaughan Pratt's algorithm (Top Down Operator Precedence).
@@ -45,6 +46,11 @@ SPECIAL_SYMBOLS = frozenset((
     '(integer)', '(name)', '(invalid)', '(unknown)',
 ))
 
+_SPACES_PATTERN = re.compile(r'\s*')
+
+# Lookup table for small integer literals, faster than calling int()
+_SMALL_INTEGERS = {str(k): k for k in range(257)}
+
 
 class ParseError(SyntaxError):
     """An error when parsing source with TDOP parser."""
@@ -118,11 +124,12 @@ class MultiLabel:
 TK = TypeVar('TK', bound='Token[Any]')
 
 
-class Token(MutableSequence[TK]):
+class Token(Generic[TK]):
     """
     Token base class for defining a parser based on Pratt's method.
 
-    Each token instance is a list-like object. The number of token's items is
+    Each token instance is a list-like object, registered as a virtual
+    subclass of MutableSequence. The number of token's items is
     the arity of the represented operator, where token's items are the operands.
     Nullary operators are used for symbols, names and literals. Tokens with items
     represent the other operators (unary, binary and so on).
@@ -195,6 +202,46 @@ class Token(MutableSequence[TK]):
     def insert(self, i: int, item: TK) -> None:
         self._items.insert(i, item)
 
+    # Sequence methods delegated to the list of items: tokens are not derived
+    # from the MutableSequence ABC for having faster isinstance() checks on
+    # token classes, that are plain classes instead of ABCMeta instances.
+    def __iter__(self) -> Iterator[TK]:
+        return iter(self._items)
+
+    def __reversed__(self) -> Iterator[TK]:
+        return reversed(self._items)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._items
+
+    def index(self, item: TK, start: int = 0, stop: int = sys.maxsize) -> int:
+        return self._items.index(item, start, stop)
+
+    def count(self, item: TK) -> int:
+        return self._items.count(item)
+
+    def append(self, item: TK) -> None:
+        self._items.append(item)
+
+    def extend(self, items: Iterable[TK]) -> None:
+        self._items.extend(items)
+
+    def __iadd__(self, items: Iterable[TK]) -> 'Token[TK]':
+        self._items.extend(items)
+        return self
+
+    def pop(self, i: int = -1) -> TK:
+        return self._items.pop(i)
+
+    def remove(self, item: TK) -> None:
+        self._items.remove(item)
+
+    def reverse(self) -> None:
+        self._items.reverse()
+
+    def clear(self) -> None:
+        self._items.clear()
+
     def __str__(self) -> str:
         if self.symbol in SPECIAL_SYMBOLS:
             return '%r %s' % (self.value, self.symbol[1:-1])
@@ -211,7 +258,7 @@ class Token(MutableSequence[TK]):
 
     @property
     def arity(self) -> int:
-        return len(self)
+        return len(self._items)
 
     @property
     def tree(self) -> str:
@@ -221,13 +268,13 @@ class Token(MutableSequence[TK]):
         elif self.symbol in SPECIAL_SYMBOLS:
             return '(%r)' % self.value
         elif self.symbol == '(':
-            if len(self) == 1:
-                return self[0].tree
-            return f"({' '.join(item.tree for item in self)})"
-        elif not self:
+            if len(self._items) == 1:
+                return self._items[0].tree
+            return f"({' '.join(item.tree for item in self._items)})"
+        elif not self._items:
             return '(%s)' % self.symbol
         else:
-            return f"({self.symbol} {' '.join(item.tree for item in self)})"
+            return f"({self.symbol} {' '.join(item.tree for item in self._items)})"
 
     @property
     def source(self) -> str:
@@ -240,26 +287,28 @@ class Token(MutableSequence[TK]):
         elif symbol in SPECIAL_SYMBOLS:
             return repr(self.value).replace(r'\\', '\\')
         else:
-            length = len(self)
+            items = self._items
+            length = len(items)
             if not length:
                 return symbol
             elif length == 1:
                 if 'postfix' in self.label:
-                    return '%s %s' % (self[0].source, symbol)
-                return '%s %s' % (symbol, self[0].source)
+                    return '%s %s' % (items[0].source, symbol)
+                return '%s %s' % (symbol, items[0].source)
             elif length == 2:
-                return '%s %s %s' % (self[0].source, symbol, self[1].source)
+                return '%s %s %s' % (items[0].source, symbol, items[1].source)
             else:
-                return '%s %s' % (symbol, ' '.join(item.source for item in self))
+                return '%s %s' % (symbol, ' '.join(item.source for item in items))
 
     @property
     def position(self) -> Tuple[int, int]:
         """A tuple with the position of the token in terms of line and column."""
         token_index = self.span[0]
-        line = self.parser.source[:token_index].count('\n') + 1
-        if line == 1:
+        newlines = self.parser.newlines
+        line = bisect_left(newlines, token_index)
+        if not line:
             return 1, token_index + 1
-        return line, token_index - self.parser.source[:token_index].rindex('\n')
+        return line + 1, token_index - newlines[line - 1]
 
     def as_name(self) -> 'Token[TK]':
         """Returns a new '(name)' token for resolving ambiguous states."""
@@ -275,7 +324,9 @@ class Token(MutableSequence[TK]):
         Returns `True` if the token is positioned at the start
         of the source, ignoring the spaces.
         """
-        return not bool(self.parser.source[0:self.span[0]].strip())
+        token_index = self.span[0]
+        match = _SPACES_PATTERN.match(self.parser.source, 0, token_index)
+        return match is not None and match.end() == token_index
 
     def is_line_start(self) -> bool:
         """
@@ -283,12 +334,9 @@ class Token(MutableSequence[TK]):
         of a source line, ignoring the spaces.
         """
         token_index = self.span[0]
-        try:
-            line_start = self.parser.source[:token_index].rindex('\n') + 1
-        except ValueError:
-            return not bool(self.parser.source[:token_index].strip())
-        else:
-            return not bool(self.parser.source[line_start:token_index].strip())
+        line_start = self.parser.source.rfind('\n', 0, token_index) + 1
+        match = _SPACES_PATTERN.match(self.parser.source, line_start, token_index)
+        return match is not None and match.end() == token_index
 
     def is_spaced(self, before: bool = True, after: bool = True) -> bool:
         """
@@ -322,7 +370,7 @@ class Token(MutableSequence[TK]):
         """Returns a generator for iterating the token's tree."""
         status: List[Tuple[Optional['Token[TK]'], Iterator['Token[TK]']]] = []
         parent: Optional['Token[TK]'] = self
-        children: Iterator['Token[TK]'] = iter(self)
+        children: Iterator['Token[TK]'] = iter(self._items)
         tk: 'Token[TK]'
 
         while True:
@@ -341,7 +389,7 @@ class Token(MutableSequence[TK]):
                         parent = None
                     continue
                 status.append((parent, children))
-                parent, children = tk, iter(tk)
+                parent, children = tk, iter(tk._items)
                 break
             else:
                 try:
@@ -366,22 +414,24 @@ class Token(MutableSequence[TK]):
             raise self.wrong_syntax(message)
 
     def wrong_syntax(self, message: Optional[str] = None) -> ParseError:
-        if message:
-            return ParseError(message)
-        elif self.symbol not in SPECIAL_SYMBOLS:
-            return ParseError('unexpected %s' % self)
+        return ParseError(message or self._wrong_syntax_message())
+
+    def _wrong_syntax_message(self) -> str:
+        """Returns the default message for a syntax error on the token."""
+        if self.symbol not in SPECIAL_SYMBOLS:
+            return 'unexpected %s' % self
         elif self.symbol == '(invalid)':
-            return ParseError('invalid literal %r' % self.value)
+            return 'invalid literal %r' % self.value
         elif self.symbol == '(unknown)':
-            return ParseError('unknown symbol %r' % self.value)
+            return 'unknown symbol %r' % self.value
         elif self.symbol == '(name)':
-            return ParseError('unexpected name %r' % self.value)
+            return 'unexpected name %r' % self.value
         elif self.symbol != '(end)':
-            return ParseError('unexpected literal %r' % self.value)
+            return 'unexpected literal %r' % self.value
         elif self.parser.token.symbol == '(start)':
-            return ParseError('source is empty')
+            return 'source is empty'
         else:
-            return ParseError('unexpected end of source')
+            return 'unexpected end of source'
 
     def wrong_type(self, message: str = 'invalid type') -> TypeError:
         return TypeError(message)
@@ -390,6 +440,9 @@ class Token(MutableSequence[TK]):
         return ValueError(message)
 
 
+MutableSequence.register(Token)
+
+
 class ParserMeta(ABCMeta):
 
     token_base_class: Type[Any]
@@ -429,6 +482,8 @@ class ParserMeta(ABCMeta):
 
 TK_co = TypeVar('TK_co', bound=Token[Any], covariant=True)
 
+TokenizerKeyType = Tuple[str, str, FrozenSet[Tuple[str, Optional[str]]]]
+
 
 class Parser(Generic[TK_co], metaclass=ParserMeta):
     """
@@ -442,7 +497,19 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
     tokenizer: Optional[Pattern[str]] = None
     symbol_table: Dict[str, Type[TK_co]] = {}
 
+    # A cache of compiled tokenizers, shared between parser classes and instances
+    # with the same symbols (e.g. schema bound parsers that rebuild the tokenizer).
+    _tokenizers: Dict[TokenizerKeyType, Pattern[str]] = {}
+    _tokenizers_maxsize = 64
+
+    parse_cache_maxsize = 128
+    """The maximum number of token trees cached by :meth:`parse_cached`."""
+
+    _symbols_version = 0  # Bumped by registrations, invalidates parse caches.
+
     _start_token: TK_co
+    _end_token: TK_co
+    _newlines: Tuple[str, List[int]]
     source: str
     tokens: Iterator[Match[str]]
     token: TK_co
@@ -450,8 +517,10 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
     next_match: Optional[Match[str]]
     literals_pattern: Pattern[str]
     name_pattern: Pattern[str]
+    _parse_cache: Dict[Tuple[str, int, Optional[Pattern[str]]], TK_co]
 
-    __slots__ = 'source', 'tokens', 'next_match', '_start_token', 'token', 'next_token'
+    __slots__ = 'source', 'tokens', 'next_match', '_start_token', '_end_token', \
+        'token', 'next_token', '_parse_cache', '_newlines'
 
     def __init__(self) -> None:
         if self.tokenizer is None:
@@ -460,7 +529,10 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
         self.tokens = iter(())
         self.next_match = None
         self._start_token = self.symbol_table['(start)'](self)
+        self._end_token = self.symbol_table['(end)'](self)
         self.token = self.next_token = self._start_token
+        self._parse_cache = {}
+        self._newlines = '', []
 
     def __repr__(self) -> str:
         return '<%s object at %#x>' % (self.__class__.__name__, id(self))
@@ -484,7 +556,7 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
         assert self.tokenizer, "Parser tokenizer is not built!"
         try:
             try:
-                self.tokens = iter(self.tokenizer.finditer(source))
+                self.tokens = self.tokenizer.finditer(source)
             except TypeError as err:
                 token = self.symbol_table['(invalid)'](self, source)
                 raise token.wrong_syntax('invalid source type, {}'.format(err))
@@ -499,6 +571,33 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
             self.next_match = None
             self.token = self.next_token = self._start_token
 
+    def parse_cached(self, source: str) -> TK_co:
+        """
+        Like :meth:`parse` but returns the same token tree when the same source
+        is parsed again by the parser instance. Useful for evaluating repeatedly
+        a limited set of expressions. The cache is bounded and it's invalidated
+        by changes to the symbols of the parser. Changes to the static context
+        of the parser instance (e.g. the *namespaces* of an XPath parser) don't
+        invalidate the cached token trees.
+
+        :param source: The source string.
+        :return: The root of the token's tree that parse the source.
+        """
+        if self.tokenizer is None:
+            # Reset by instance changes of the symbols: rebuild it for the key
+            self.tokenizer = self.create_tokenizer(self.symbol_table)  # type: ignore[misc]
+
+        key = source, self._symbols_version, self.tokenizer
+        try:
+            root_token = self._parse_cache.pop(key)
+        except KeyError:
+            root_token = self.parse(source)
+            if len(self._parse_cache) >= self.parse_cache_maxsize:
+                self._parse_cache.pop(next(iter(self._parse_cache)))
+
+        self._parse_cache[key] = root_token  # Re-insert as the most recent
+        return root_token
+
     def advance(self, *symbols: str, message: Optional[str] = None) -> TK_co:
         """
         The Pratt's function for advancing to next token.
@@ -522,7 +621,9 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
             if not self.next_match.group().isspace():
                 break
         else:
-            self.next_token = self.symbol_table['(end)'](self)
+            # Reuse the '(end)' token instance, updating its position
+            self.next_token = self._end_token
+            self.next_token.span = self.next_match.span() if self.next_match else (0, 0)
             return self.token
 
         literal, symbol, name, unknown = self.next_match.groups()
@@ -538,6 +639,12 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
             if literal[0] in '\'"':
                 value = self.unescape(literal)
                 self.next_token = self.symbol_table['(string)'](self, value)
+            elif literal.isdecimal():
+                # Most frequent numeric case, classified with a single scan
+                value = _SMALL_INTEGERS.get(literal)
+                if value is None:
+                    value = int(literal)
+                self.next_token = self.symbol_table['(integer)'](self, value)
             elif 'e' in literal or 'E' in literal:
                 try:
                     value = float(literal)
@@ -587,7 +694,8 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
             try:
                 self.next_match = next(self.tokens)
             except StopIteration:
-                self.next_token = self.symbol_table['(end)'](self)
+                self.next_token = self._end_token
+                self.next_token.span = self.next_match.span() if self.next_match else (0, 0)
                 break
             else:
                 symbol = self.next_match.group(2)
@@ -627,6 +735,15 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
         """Property that returns the current line and column indexes."""
         return self.token.position
 
+    @property
+    def newlines(self) -> List[int]:
+        """The sorted list of the indexes of newlines in the source."""
+        source, newlines = self._newlines
+        if source is not self.source:
+            newlines = [m.start() for m in re.finditer('\n', self.source)]
+            self._newlines = self.source, newlines
+        return newlines
+
     def is_source_start(self) -> bool:
         """
         Returns `True` if the parser is positioned at the start
@@ -700,10 +817,9 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
                     '__return__': None
                 })
                 token_class = cast(
-                    Type[TK_co], ABCMeta(token_class_name, token_class_bases, kwargs)
+                    Type[TK_co], type(token_class_name, token_class_bases, kwargs)
                 )
                 cls.symbol_table[lookup_name] = token_class
-                MutableSequence.register(token_class)
                 setattr(sys.modules[cls.__module__], token_class_name, token_class)
 
         elif not isinstance(symbol, type) or not issubclass(symbol, Token):
@@ -713,6 +829,7 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
             if cls.symbol_table.get(symbol.lookup_name) is not token_class:
                 raise ValueError("Token class %r is not registered." % token_class)
 
+        cls._symbols_version += 1
         for key, value in kwargs.items():
             if key == 'lbp' and value > token_class.lbp:
                 token_class.lbp = value
@@ -727,6 +844,7 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
     def unregister(cls, symbol: str) -> None:
         """Unregister a token class from the symbol table."""
         del cls.symbol_table[symbol.strip()]
+        cls._symbols_version += 1
 
     @classmethod
     def duplicate(cls, symbol: str, new_symbol: str, **kwargs: Any) -> Type[TK_co]:
@@ -761,7 +879,7 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
     def prefix(cls, symbol: str, bp: int = 0) -> Type[TK_co]:
         """Register a token for a symbol that represents a *prefix* unary operator."""
         def nud(self: Token[TK_co]) -> Token[TK_co]:
-            self[:] = self.parser.expression(rbp=bp),
+            self._items = cast(List[TK_co], [self.parser.expression(rbp=bp)])
             return self
         return cls.register(symbol, label='prefix operator', lbp=bp, rbp=bp, nud=nud)
 
@@ -769,7 +887,7 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
     def postfix(cls, symbol: str, bp: int = 0) -> Type[TK_co]:
         """Register a token for a symbol that represents a *postfix* unary operator."""
         def led(self: Token[TK_co], left: Token[TK_co]) -> Token[TK_co]:
-            self[:] = left,
+            self._items = cast(List[TK_co], [left])
             return self
         return cls.register(symbol, label='postfix operator', lbp=bp, rbp=bp, led=led)
 
@@ -777,7 +895,7 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
     def infix(cls, symbol: str, bp: int = 0) -> Type[TK_co]:
         """Register a token for a symbol that represents an *infix* binary operator."""
         def led(self: Token[TK_co], left: Token[TK_co]) -> Token[TK_co]:
-            self[:] = left, self.parser.expression(rbp=bp)
+            self._items = cast(List[TK_co], [left, self.parser.expression(rbp=bp)])
             return self
         return cls.register(symbol, label='operator', lbp=bp, rbp=bp, led=led)
 
@@ -785,7 +903,7 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
     def infixr(cls, symbol: str, bp: int = 0) -> Type[TK_co]:
         """Register a token for a symbol that represents an *infixr* binary operator."""
         def led(self: Token[TK_co], left: Token[TK_co]) -> Token[TK_co]:
-            self[:] = left, self.parser.expression(rbp=bp - 1)
+            self._items = cast(List[TK_co], [left, self.parser.expression(rbp=bp - 1)])
             return self
         return cls.register(symbol, label='operator', lbp=bp, rbp=bp - 1, led=led)
 
@@ -803,6 +921,7 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
             if not callable(getattr(token_class, method_name)):
                 raise TypeError(f"{method_name!r} is not a method of {token_class}")
             setattr(token_class, method_name, func)
+            cls._symbols_version += 1
             return func
         return bind
 
@@ -836,6 +955,17 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
 
         :param symbol_table: a dictionary containing the token classes of the formal language.
         """
+        key = (
+            cls.literals_pattern.pattern,
+            cls.name_pattern.pattern,
+            frozenset((k, v.pattern) for k, v in symbol_table.items()
+                      if k not in SPECIAL_SYMBOLS)
+        )
+        try:
+            return cls._tokenizers[key]
+        except KeyError:
+            pass
+
         character_patterns = []
         string_patterns = []
         name_patterns = []
@@ -865,9 +995,23 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
         if custom_patterns:
             symbols_patterns.append('|'.join(custom_patterns))
 
-        tokenizer_pattern = r"({})|({})|({})|(\S)|\s+".format(
+        # The tokenizer requires a backtracking regex engine: names and custom
+        # patterns use lookaheads (e.g. function names followed by a '('), that
+        # are not supported by automata based engines like RE2 or Hyperscan.
+        # Extra spaces are tried first, because they are frequent between tokens
+        # and no other alternative starts with a whitespace.
+        tokenizer_pattern = r"\s+|({})|({})|({})|(\S)".format(
             cls.literals_pattern.pattern,
             '|'.join(symbols_patterns),
             cls.name_pattern.pattern
         )
-        return re.compile(tokenizer_pattern)
+        tokenizer = re.compile(tokenizer_pattern)
+
+        if len(cls._tokenizers) >= cls._tokenizers_maxsize:
+            try:
+                # Other threads can evict the same entry or resize the cache
+                cls._tokenizers.pop(next(iter(cls._tokenizers)), None)
+            except (RuntimeError, StopIteration):
+                pass
+        cls._tokenizers[key] = tokenizer
+        return tokenizer
@@ -158,21 +158,26 @@ def build_node_tree(root: ElementTreeRootType,
                 child = ProcessingInstructionNode(elem, parent, position)
 
             parent.children.append(child)
-            if elem.tail is not None:
-                parent.children.append(TextNode(elem.tail, parent, position))
-                position += 1
-
             if len(elem):
                 ancestors.append(parent)
                 parent = child
                 iterators.append(children)
                 children = iter(elem)
                 break
+            elif elem.tail is not None:
+                parent.children.append(TextNode(elem.tail, parent, position))
+                position += 1
         else:
             try:
                 children, parent = iterators.pop(), ancestors.pop()
             except IndexError:
                 return root_node
+            else:
+                # The tail follows the subtree of the last child in document order
+                elem = parent.children[-1].elem
+                if elem.tail is not None:
+                    parent.children.append(TextNode(elem.tail, parent, position))
+                    position += 1
 
 
 def build_lxml_node_tree(root: LxmlRootType,
@@ -197,12 +202,13 @@ def build_lxml_node_tree(root: LxmlRootType,
     def build_lxml_element_node() -> ElementNode:
         nonlocal position
 
-        node = ElementNode(elem, parent, position, elem.nsmap)
+        nsmap = elem.nsmap  # a new dict is built by lxml at each access
+        node = ElementNode(elem, parent, position, nsmap)
         position += 1
         elements[elem] = node
 
         # Do not generate namespace and attribute nodes, only reserve positions.
-        position += len(elem.nsmap) + int('xml' not in elem.nsmap) + len(elem.attrib)
+        position += len(nsmap) + int('xml' not in nsmap) + len(elem.attrib)
 
         if elem.text is not None:
             node.children.append(TextNode(elem.text, node, position))
@@ -304,21 +310,26 @@ def build_lxml_node_tree(root: LxmlRootType,
                 child = ProcessingInstructionNode(elem, parent, position)
 
             parent.children.append(child)
-            if elem.tail is not None:
-                parent.children.append(TextNode(elem.tail, parent, position))
-                position += 1
-
             if len(elem):
                 ancestors.append(parent)
                 parent = child
                 iterators.append(children)
                 children = iter(elem)
                 break
+            elif elem.tail is not None:
+                parent.children.append(TextNode(elem.tail, parent, position))
+                position += 1
         else:
             try:
                 children, parent = iterators.pop(), ancestors.pop()
             except IndexError:
                 return root_node
+            else:
+                # The tail follows the subtree of the last child in document order
+                elem = parent.children[-1].elem
+                if elem.tail is not None:
+                    parent.children.append(TextNode(elem.tail, parent, position))
+                    position += 1
 
 
 def build_schema_node_tree(root: SchemaElemType,
@@ -372,7 +383,8 @@ def build_schema_node_tree(root: SchemaElemType,
         # Track global elements even if the initial root is not a schema to avoid circularity
         global_elements = []
 
-    local_nodes = {root: root_node}  # Irrelevant even if it's the schema
+    # Local elements are tracked by identity, schema components can have a costly hash
+    local_nodes = {id(root): root_node}  # Irrelevant even if it's the schema
     ref_nodes: List[SchemaElementNode] = []
     iterators: List[Any] = []
     ancestors: List[Any] = []
@@ -383,13 +395,13 @@ def build_schema_node_tree(root: SchemaElemType,
             child.xsd_type = elem.type
             parent.children.append(child)
 
-            if elem in local_nodes:
+            if id(elem) in local_nodes:
                 if elem.ref is None:
-                    child.children = local_nodes[elem].children
+                    child.children = local_nodes[id(elem)].children
                 else:
                     ref_nodes.append(child)
             else:
-                local_nodes[elem] = child
+                local_nodes[id(elem)] = child
                 if elem.ref is None:
                     ancestors.append(parent)
                     parent = child
@@ -71,7 +71,7 @@ def nud_name_literal(self):
 
 @method('(name)')
 def evaluate_name_literal(self, context=None):
-    return [x for x in self.select(context)]
+    return list(self.select(context))
 
 
 @method('(name)')
@@ -201,7 +201,7 @@ class _PrefixedReferenceToken(XPathToken):
     def evaluate(self, context=None):
         if self[1].label.endswith('function'):
             return self[1].evaluate(context)
-        return [x for x in self.select(context)]
+        return list(self.select(context))
 
     def select(self, context=None):
         if self[1].label.endswith('function'):
@@ -301,7 +301,7 @@ def nud_namespace_uri(self):
 def evaluate_namespace_uri(self, context=None):
     if self[1].label.endswith('function'):
         return self[1].evaluate(context)
-    return [x for x in self.select(context)]
+    return list(self.select(context))
 
 
 @method('{')
@@ -592,7 +592,7 @@ def evaluate_multiply_operator(self, context=None):
                 raise self.error('FOAR0002', err) from None
     else:
         # This is not a multiplication operator but a wildcard select statement
-        return [x for x in self.select(context)]
+        return list(self.select(context))
 
 
 @method(infix('div', bp=45))
@@ -15,6 +15,7 @@ import math
 import operator
 from copy import copy
 from decimal import Decimal, DivisionByZero
+from itertools import chain
 
 from ..exceptions import ElementPathError
 from ..helpers import OCCURRENCE_INDICATORS, numeric_equal, numeric_not_equal, \
@@ -610,10 +611,16 @@ def evaluate_node_comparison(self, context=None):
         if left[0] is right[0]:
             return False
 
-        documents = [context.root]
-        documents.extend(v for v in context.variables.values() if isinstance(v, DocumentNode))
+        visited = set()
+        documents = chain((context.root,), (
+            v for v in context.variables.values() if isinstance(v, DocumentNode)
+        ))
 
         for root in documents:
+            if id(root) in visited:
+                continue  # a variable can refer to the context root
+            visited.add(id(root))
+
             for item in root.iter_document():  # pragma: no cover
                 if left[0] is item:
                     return True if symbol == '<<' else False
@@ -10,9 +10,7 @@
 """
 XPath 2.0 implementation - part 1 (parser class and symbols)
 """
-from abc import ABCMeta
 import locale
-from collections.abc import MutableSequence
 from urllib.parse import urlparse
 from typing import cast, Any, Callable, ClassVar, Dict, List, \
     MutableMapping, Optional, Tuple, Type, Union
@@ -351,9 +349,8 @@ class XPath2Parser(XPath1Parser):
             '__return__': None
         }
         token_class = cast(
-            Type[XPathFunction], ABCMeta(token_class_name, (XPathFunction,), kwargs)
+            Type[XPathFunction], type(token_class_name, (XPathFunction,), kwargs)
         )
-        MutableSequence.register(token_class)
 
         if self.symbol_table is self.__class__.symbol_table:
             self.symbol_table = dict(self.__class__.symbol_table)
@@ -432,9 +429,8 @@ class XPath2Parser(XPath1Parser):
                 '__return__': None
             }
             proxy_class = cast(
-                Type[ProxyToken], ABCMeta(class_name, (ProxyToken,), kwargs)
+                Type[ProxyToken], type(class_name, (ProxyToken,), kwargs)
             )
-            MutableSequence.register(proxy_class)
             self.symbol_table[symbol] = proxy_class
 
         def evaluate_external_function(self_: XPathFunction,
@@ -497,9 +493,8 @@ class XPath2Parser(XPath1Parser):
                     )
 
         token_class = cast(
-            Type[XPathFunction], ABCMeta(class_name, (XPathFunction,), kwargs)
+            Type[XPathFunction], type(class_name, (XPathFunction,), kwargs)
         )
-        MutableSequence.register(token_class)
 
         self.symbol_table[lookup_name] = token_class
         self.tokenizer = None
@@ -9,6 +9,7 @@
 #
 import datetime
 import importlib
+import sys
 from copy import copy
 from types import ModuleType
 from typing import TYPE_CHECKING, cast, Dict, Any, List, Iterator, \
@@ -198,7 +199,7 @@ class XPathContext:
         obj: XPathContext = object.__new__(self.__class__)
         obj.__dict__.update(self.__dict__)
         obj.axis = None
-        obj.variables = {k: v for k, v in self.variables.items()}
+        obj.variables = self.variables.copy()
         return obj
 
     @property
@@ -217,11 +218,31 @@ class XPathContext:
             else:
                 etree_module_name = 'lxml.etree'
 
-            self._etree: ModuleType = importlib.import_module(etree_module_name)
+            try:
+                # Skip the import machinery if the module is already loaded
+                self._etree = sys.modules[etree_module_name]
+            except KeyError:
+                self._etree = importlib.import_module(etree_module_name)
 
         return self._etree
 
     def get_root(self, node: Any) -> Union[None, ElementNode, DocumentNode]:
+        if isinstance(node, XPathNode):
+            # Fast path: search the roots among the ancestors of the node
+            ancestors = set()
+            parent: Optional[XPathNode] = node
+            while parent is not None:
+                ancestors.add(id(parent))
+                parent = parent.parent
+
+            if id(self.root) in ancestors:
+                return self.root
+            elif self.documents is not None:
+                for doc in self.documents.values():
+                    if id(doc) in ancestors:
+                        return doc
+
+        # Fallback for nodes not linked to their roots (e.g. global schema elements)
         if isinstance(self.root, (DocumentNode, ElementNode)):
             if any(node is x for x in self.root.iter()):
                 return self.root
@@ -434,23 +455,22 @@ class XPathContext:
                 item = self.item
 
                 if item.parent is not None:
+                    siblings = item.parent.children
+                    try:
+                        # Nodes don't override __eq__(), so index() compares identities
+                        index = siblings.index(cast(ChildNodeType, item))
+                    except ValueError:
+                        return  # attribute and namespace nodes have no siblings
+
                     status = self.item, self.axis
                     self.axis = axis or 'following-sibling'
 
                     if axis == 'preceding-sibling':
-                        for child in item.parent:  # pragma: no cover
-                            if child is item:
-                                break
-                            self.item = child
-                            yield child
+                        for self.item in siblings[:index]:
+                            yield self.item
                     else:
-                        follows = False
-                        for child in item.parent:
-                            if follows:
-                                self.item = child
-                                yield child
-                            elif child is item:
-                                follows = True
+                        for self.item in siblings[index + 1:]:
+                            yield self.item
 
                     self.item, self.axis = status
 
@@ -505,27 +525,55 @@ class XPathContext:
         """Iterator for 'preceding' reverse axis."""
         ancestors: Set[Union[ElementNode, DocumentNode]]
         item: XPathNode
+        chain: List[Any]
 
         if isinstance(self.item, XPathNode):
             if self.document is not None or self.item is not self.root:
                 item = self.item
+                if isinstance(item, (AttributeNode, NamespaceNode)):
+                    # Preceding nodes of the parent element, that is an ancestor
+                    if item.parent is None or \
+                            item.parent is self.root and self.document is None:
+                        return
+                    item = item.parent
 
-                if (root := item.parent) is not None:
+                if item.parent is not None:
                     status = self.item, self.axis
                     self.axis = 'preceding'
-                    ancestors = {root}
 
-                    while root.parent is not None:
-                        if root is self.root and self.document is None:
+                    # The chain of ancestors, walked from the top: at each level
+                    # the preceding siblings and their subtrees are yielded, so
+                    # the ancestors are excluded without checking each node.
+                    chain = [item]
+                    root = item.parent
+                    while True:
+                        chain.append(root)
+                        if root.parent is None or root is self.root and self.document is None:
                             break
                         root = root.parent
-                        ancestors.add(root)
 
-                    for self.item in root.iter_descendants():
-                        if self.item is item:
-                            break
-                        if self.item not in ancestors:
-                            yield self.item
+                    if isinstance(item, SchemaElementNode):
+                        # Schema trees can share subtrees between siblings, so
+                        # they are scanned once from the top, excluding ancestors.
+                        ancestors = set(chain[1:])
+                        for self.item in root.iter_descendants():
+                            if self.item is item:
+                                break
+                            if self.item not in ancestors:
+                                yield self.item
+                        self.item, self.axis = status
+                        return
+
+                    for k in range(len(chain) - 1, 0, -1):
+                        for child in chain[k]:
+                            if child is chain[k - 1]:
+                                break
+                            elif isinstance(child, ElementNode):
+                                for self.item in child.iter_descendants():
+                                    yield self.item
+                            else:
+                                self.item = child
+                                yield child
 
                     self.item, self.axis = status
 
@@ -535,17 +583,31 @@ class XPathContext:
             status = self.item, self.axis
             self.axis = 'following'
 
-            descendants = set(self.item.iter_descendants())
-            position = self.item.position
-
             root = self.item
             while isinstance(root.parent, ElementNode) and root is not self.root:
                 root = root.parent
 
-            for item in root.iter_descendants(with_self=False):
-                if position < item.position and item not in descendants:
-                    self.item = item
-                    yield cast(ChildNodeType, self.item)
+            if isinstance(self.item, SchemaElementNode):
+                # Schema trees can share subtrees and link references,
+                # so positions don't bound the subtree of the item.
+                descendants = set(self.item.iter_descendants())
+                position = self.item.position
+                for item in root.iter_descendants(with_self=False):
+                    if position < item.position and item not in descendants:
+                        self.item = item
+                        yield cast(ChildNodeType, self.item)
+            else:
+                # Positions are in document order, so the subtree of the
+                # context item ends with the position of its last descendant.
+                last: XPathNode = self.item
+                while isinstance(last, ElementNode) and last.children:
+                    last = last.children[-1]
+                position = last.position
+
+                for item in root.iter_descendants(with_self=False):
+                    if position < item.position:
+                        self.item = item
+                        yield cast(ChildNodeType, self.item)
 
             self.item, self.axis = status
 
@@ -439,6 +439,8 @@ class ElementNode(XPathNode):
     _attributes: Optional[List['AttributeNode']]
 
     uri: Optional[str] = None
+    _path: Optional[str] = None
+    _text_content: Optional[str] = None
 
     __slots__ = 'nsmap', 'elem', 'xsd_type', 'elements', \
                 '_namespace_nodes', '_attributes', 'children', '__dict__'
@@ -477,7 +479,7 @@ class ElementNode(XPathNode):
         return len(self.children)
 
     def __iter__(self) -> Iterator[ChildNodeType]:
-        yield from self.children
+        return iter(self.children)
 
     @property
     def value(self) -> Union[ElementProtocol, SchemaElemType]:
@@ -527,14 +529,19 @@ class ElementNode(XPathNode):
         if self.xsd_type is not None and self.xsd_type.is_element_only():
             # Element-only text content is normalized
             return ''.join(etree_iter_strings(self.elem, normalize=True))
-        return ''.join(etree_iter_strings(self.elem))
+        elif self._text_content is None:
+            # The text content of the subtree is computed once
+            self._text_content = ''.join(etree_iter_strings(self.elem))
+        return self._text_content
 
     @property
     def typed_value(self) -> Optional[AtomicValueType]:
         if self.xsd_type is None or \
                 self.xsd_type.name in _XSD_SPECIAL_TYPES or \
                 self.xsd_type.has_mixed_content():
-            return UntypedAtomic(''.join(etree_iter_strings(self.elem)))
+            if self._text_content is None:
+                self._text_content = ''.join(etree_iter_strings(self.elem))
+            return UntypedAtomic(self._text_content)
         elif self.xsd_type.is_element_only() or self.xsd_type.is_empty():
             return None
         elif self.elem.get(XSI_NIL) and getattr(self.xsd_type.parent, 'nillable', None):
@@ -567,25 +574,34 @@ class ElementNode(XPathNode):
     @property
     def attributes(self) -> List['AttributeNode']:
         if self._attributes is None:
-            position = self.position + len(self.nsmap) + int('xml' not in self.nsmap)
-            self._attributes = [
-                AttributeNode(name, cast(str, value), self, pos)
-                for pos, (name, value) in enumerate(self.elem.attrib.items(), position)
-            ]
+            if not self.elem.attrib:
+                self._attributes = []
+            else:
+                position = self.position + len(self.nsmap) + int('xml' not in self.nsmap)
+                self._attributes = [
+                    AttributeNode(name, cast(str, value), self, pos)
+                    for pos, (name, value) in enumerate(self.elem.attrib.items(), position)
+                ]
         return self._attributes
 
     @property
     def path(self) -> str:
-        """Returns an absolute path for the node."""
-        path = []
-        item: Any = self
-        while True:
-            if isinstance(item, ElementNode):
-                path.append(item.elem.tag)
+        """Returns an absolute path for the node. The path is computed once."""
+        if self._path is not None:
+            return self._path
 
+        # Climb up to the nearest ancestor with a known path, then
+        # fill the paths of the element nodes on the way back.
+        nodes = []
+        item: Any = self
+        while isinstance(item, ElementNode) and item._path is None:
+            nodes.append(item)
             item = item.parent
-            if item is None:
-                return '/{}'.format('/'.join(reversed(path)))
+
+        path = cast(str, item._path) if isinstance(item, ElementNode) else ''
+        for item in reversed(nodes):
+            path = item._path = f'{path}/{item.elem.tag}'
+        return path
 
     def is_schema_node(self) -> bool:
         return hasattr(self.elem, 'name') and hasattr(self.elem, 'type')
@@ -773,7 +789,7 @@ class DocumentNode(XPathNode):
         return len(self.children)
 
     def __iter__(self) -> Iterator[ChildNodeType]:
-        yield from self.children
+        return iter(self.children)
 
     @property
     def value(self) -> DocumentProtocol:
@@ -924,11 +940,14 @@ class SchemaElementNode(ElementNode):
     @property
     def attributes(self) -> List['AttributeNode']:
         if self._attributes is None:
-            position = self.position + len(self.nsmap) + int('xml' not in self.nsmap)
-            self._attributes = [
-                AttributeNode(name, attr, self, pos, attr.type)
-                for pos, (name, attr) in enumerate(self.elem.attrib.items(), position)
-            ]
+            if not self.elem.attrib:
+                self._attributes = []
+            else:
+                position = self.position + len(self.nsmap) + int('xml' not in self.nsmap)
+                self._attributes = [
+                    AttributeNode(name, attr, self, pos, attr.type)
+                    for pos, (name, attr) in enumerate(self.elem.attrib.items(), position)
+                ]
         return self._attributes
 
     @property
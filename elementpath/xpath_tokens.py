@@ -102,7 +102,7 @@ class XPathToken(Token[XPathTokenType]):
 
         :param context: The XPath dynamic context.
         """
-        return [x for x in self.select(context)]
+        return list(self.select(context))
 
     def select(self, context: ContextArgType = None) -> Iterator[Any]:
         """
@@ -212,17 +212,19 @@ class XPathToken(Token[XPathTokenType]):
         returning QNames in prefixed format. A leaf element is an element
         positioned at last path step. Does not consider kind tests and wildcards.
         """
-        if self.symbol in ('(name)', ':'):
-            yield cast(str, self.value)
-        elif self.symbol in ('//', '/'):
-            if self._items[-1].symbol in _LEAF_ELEMENTS_TOKENS:
-                yield from self._items[-1].iter_leaf_elements()
-
-        elif self.symbol in ('[',):
-            yield from self._items[0].iter_leaf_elements()
-        else:
-            for tk in self._items:
-                yield from tk.iter_leaf_elements()
+        tokens: List[XPathToken] = [self]
+        while tokens:
+            tk = tokens.pop()
+            if tk.symbol in ('(name)', ':'):
+                yield cast(str, tk.value)
+            elif tk.symbol in ('//', '/'):
+                if tk._items[-1].symbol in _LEAF_ELEMENTS_TOKENS:
+                    tokens.append(tk._items[-1])
+
+            elif tk.symbol in ('[',):
+                tokens.append(tk._items[0])
+            else:
+                tokens.extend(reversed(tk._items))
 
     def parse_sequence_type(self) -> 'XPathToken':
         if self.parser.next_token.label in ('kind test', 'sequence type', 'function test'):
@@ -454,39 +456,35 @@ class XPathToken(Token[XPathTokenType]):
         :param context: the XPath dynamic context.
         :return: the atomized value of a single length sequence or `None` if the sequence is empty.
         """
-        selector = iter(self.atomization(context))
-        try:
-            value = next(selector)
-        except StopIteration:
+        selector = self.atomization(context)
+        value = next(selector, None)
+        if value is None:
             return None
-        else:
-            item = getattr(context, 'item', None)
 
-            try:
-                next(selector)
-            except StopIteration:
-                if isinstance(value, UntypedAtomic):
-                    value = str(value)
-
-                if not isinstance(context, XPathSchemaContext) and \
-                        item is not None and \
-                        self.xsd_types and \
-                        isinstance(value, str):
-
-                    xsd_type = self.get_xsd_type(item)
-                    if xsd_type is None or xsd_type.name in _XSD_SPECIAL_TYPES:
-                        pass
-                    else:
-                        try:
-                            value = xsd_type.decode(value)
-                        except (TypeError, ValueError):
-                            msg = "Type {!r} is not appropriate for the context"
-                            raise self.error('XPTY0004', msg.format(type(value)))
+        item = getattr(context, 'item', None)
+        if next(selector, None) is not None:
+            msg = "atomized operand is a sequence of length greater than one"
+            raise self.error('XPTY0004', msg)
 
-                return value
+        if isinstance(value, UntypedAtomic):
+            value = str(value)
+
+        if not isinstance(context, XPathSchemaContext) and \
+                item is not None and \
+                self.xsd_types and \
+                isinstance(value, str):
+
+            xsd_type = self.get_xsd_type(item)
+            if xsd_type is None or xsd_type.name in _XSD_SPECIAL_TYPES:
+                pass
             else:
-                msg = "atomized operand is a sequence of length greater than one"
-                raise self.error('XPTY0004', msg)
+                try:
+                    value = xsd_type.decode(value)
+                except (TypeError, ValueError):
+                    msg = "Type {!r} is not appropriate for the context"
+                    raise self.error('XPTY0004', msg.format(type(value)))
+
+        return value
 
     def iter_comparison_data(self, context: ContextArgType) -> Iterator[OperandsType]:
         """
@@ -529,20 +527,21 @@ class XPathToken(Token[XPathTokenType]):
             right_values = self._items[1].atomization(copy(context))
 
         for values in product(left_values, right_values):
-            if any(isinstance(x, bool) for x in values):
-                if any(isinstance(x, (str, Integer)) for x in values):
+            value1, value2 = values
+            if isinstance(value1, bool) or isinstance(value2, bool):
+                if isinstance(value1, (str, Integer)) or isinstance(value2, (str, Integer)):
                     msg = "cannot compare {!r} and {!r}"
-                    raise TypeError(msg.format(type(values[0]), type(values[1])))
-            elif any(isinstance(x, Integer) for x in values) and \
-                    any(isinstance(x, str) for x in values):
+                    raise TypeError(msg.format(type(value1), type(value2)))
+            elif isinstance(value1, Integer) and isinstance(value2, str) or \
+                    isinstance(value1, str) and isinstance(value2, Integer):
                 msg = "cannot compare {!r} and {!r}"
-                raise TypeError(msg.format(type(values[0]), type(values[1])))
-            elif any(isinstance(x, float) for x in values):
-                if isinstance(values[0], decimal.Decimal):
-                    yield float(values[0]), values[1]
+                raise TypeError(msg.format(type(value1), type(value2)))
+            elif isinstance(value1, float) or isinstance(value2, float):
+                if isinstance(value1, decimal.Decimal):
+                    yield float(value1), value2
                     continue
-                elif isinstance(values[1], decimal.Decimal):
-                    yield values[0], float(values[1])
+                elif isinstance(value2, decimal.Decimal):
+                    yield value1, float(value2)
                     continue
 
             yield values
@@ -559,7 +558,9 @@ class XPathToken(Token[XPathTokenType]):
             self.parser.check_variables(context.variables)
 
             for result in self.select(context):
-                if not isinstance(result, XPathNode):
+                if isinstance(result, ElementNode):
+                    yield result.elem
+                elif not isinstance(result, XPathNode):
                     yield result
                 elif isinstance(result, NamespaceNode):
                     if self.parser.compatibility_mode:
@@ -586,13 +587,15 @@ class XPathToken(Token[XPathTokenType]):
         """
         item = None
         if context is None:
-            results = [x for x in self.select(context)]
+            results = list(self.select(context))
         else:
             self.parser.check_variables(context.variables)
 
             results = []
             for item in self.select(context):
-                if not isinstance(item, XPathNode):
+                if isinstance(item, ElementNode):
+                    results.append(item.elem)
+                elif not isinstance(item, XPathNode):
                     results.append(item)
                 elif isinstance(item, NamespaceNode):
                     if self.parser.compatibility_mode:
@@ -1019,7 +1022,7 @@ class XPathToken(Token[XPathTokenType]):
             else:
                 obj = obj[0]
 
-        if isinstance(obj, (int, str, UntypedAtomic, AnyURI)):  # Include bool
+        if isinstance(obj, (int, str)):  # Include bool
             return bool(obj)
         elif isinstance(obj, (float, Decimal)):
             return False if math.isnan(obj) else bool(obj)
@@ -1027,6 +1030,9 @@ class XPathToken(Token[XPathTokenType]):
             return False
         elif isinstance(obj, XPathNode):
             return True
+        elif isinstance(obj, (UntypedAtomic, AnyURI)):
+            # Checked last, the isinstance() of atomic types goes through ABCMeta
+            return bool(obj)
         else:
             message = "effective boolean value is not defined for {!r}.".format(type(obj))
             raise self.error('FORG0006', message)
@@ -1077,12 +1083,14 @@ class XPathToken(Token[XPathTokenType]):
                 return str(obj).upper()
 
             value = str(obj)
-            if '.' in value:
-                value = value.rstrip('0').rstrip('.')
-            if '+' in value:
-                value = value.replace('+', '')
             if 'e' in value:
-                return value.upper()
+                # Only the mantissa can have trailing zeros to strip
+                mantissa, exponent = value.split('e')
+                if '.' in mantissa:
+                    mantissa = mantissa.rstrip('0').rstrip('.')
+                return f"{mantissa}E{exponent.lstrip('+')}"
+            elif '.' in value:
+                return value.rstrip('0').rstrip('.')
             return value
 
         elif isinstance(obj, XPathFunction):
@@ -1128,11 +1136,7 @@ class XPathToken(Token[XPathTokenType]):
         if self.label == 'function':
             code = 'XPST0017'
 
-        if message:
-            return self.error(code, message)
-
-        error = super(XPathToken, self).wrong_syntax(message)
-        return self.error(code, str(error))
+        return self.error(code, message or self._wrong_syntax_message())
 
     def wrong_value(self, message: Optional[str] = None) -> ElementPathValueError:
         return cast(ElementPathValueError, self.error('FOCA0002', message))
@@ -11,7 +11,9 @@
 import unittest
 import re
 import sys
+import threading
 from collections import namedtuple
+from collections.abc import MutableSequence
 
 from elementpath.tdop import _symbol_to_classname, ParseError, Token, \
     ParserMeta, Parser, MultiLabel
@@ -93,8 +95,8 @@ class TdopParserTest(unittest.TestCase):
         }
         pattern = Parser.create_tokenizer({t.symbol: t for t in tokens})
         self.assertEqual(pattern.pattern,
-                         '(\'[^\']*\'|"[^"]*"|(?:\\d+|\\.\\d+)(?:\\.\\d*)?(?:[Ee][+-]?\\d+)?)|'
-                         '(\\bcall\\b(?=\\s+\\())|([A-Za-z0-9_]+)|(\\S)|\\s+')
+                         '\\s+|(\'[^\']*\'|"[^"]*"|(?:\\d+|\\.\\d+)(?:\\.\\d*)?(?:[Ee][+-]?\\d+)?)|'
+                         '(\\bcall\\b(?=\\s+\\())|([A-Za-z0-9_]+)|(\\S)')
 
         tokens = {
             FakeToken(symbol='(name)', pattern=None, label='literal'),
@@ -103,8 +105,8 @@ class TdopParserTest(unittest.TestCase):
         }
         pattern = Parser.create_tokenizer({t.symbol: t for t in tokens})
         self.assertEqual(pattern.pattern,
-                         '(\'[^\']*\'|"[^"]*"|(?:\\d+|\\.\\d+)(?:\\.\\d*)?(?:[Ee][+-]?\\d+)?)|'
-                         '([\\+]|\\bcall\\b(?=\\s+\\())|([A-Za-z0-9_]+)|(\\S)|\\s+')
+                         '\\s+|(\'[^\']*\'|"[^"]*"|(?:\\d+|\\.\\d+)(?:\\.\\d*)?(?:[Ee][+-]?\\d+)?)|'
+                         '([\\+]|\\bcall\\b(?=\\s+\\())|([A-Za-z0-9_]+)|(\\S)')
 
         # Check fix for issue #10
         tk = FakeToken('{http://www.w3.org/2000/09/xmldsig#}CryptoBinary', None, 'constructor')
@@ -115,6 +117,53 @@ class TdopParserTest(unittest.TestCase):
         else:
             self.assertIn(r"(\{http\:\/\/www\.w3\.org\/2000\/09\/xmldsig\#\}", pattern.pattern)
 
+        # Tokenizers built from the same symbols are shared
+        self.assertIs(Parser.create_tokenizer({t.symbol: t for t in tokens}), pattern)
+
+    def test_create_tokenizer_concurrent_eviction(self):
+        FakeToken = namedtuple('Token', 'symbol pattern label')
+        errors = []
+        done = threading.Event()
+
+        def create_tokenizers():
+            try:
+                for k in range(2000):
+                    tk = FakeToken(f'symbol{k % 8}', None, 'operator')
+                    pattern = Parser.create_tokenizer({tk.symbol: tk})
+                    self.assertEqual(pattern.match(tk.symbol).group(2), tk.symbol)
+            except Exception as err:
+                errors.append(err)
+
+        def drop_tokenizers():
+            while not done.is_set():
+                try:
+                    Parser._tokenizers.pop(next(iter(Parser._tokenizers), None), None)
+                except RuntimeError:
+                    pass
+
+        tokenizers = Parser._tokenizers.copy()
+        maxsize = Parser._tokenizers_maxsize
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        Parser._tokenizers_maxsize = 2
+        try:
+            threads = [threading.Thread(target=create_tokenizers) for _ in range(4)]
+            droppers = [threading.Thread(target=drop_tokenizers) for _ in range(2)]
+            for t in threads + droppers:
+                t.start()
+            for t in threads:
+                t.join()
+            done.set()
+            for t in droppers:
+                t.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+            Parser._tokenizers_maxsize = maxsize
+            Parser._tokenizers.clear()
+            Parser._tokenizers.update(tokenizers)
+
+        self.assertListEqual(errors, [])
+
     def test_tokenizer_items(self):
         self.assertListEqual(self.parser.tokenizer.findall('5 56'),
                              [('5', '', '', ''), ('', '', '', ''), ('56', '', '', '')])
@@ -139,6 +188,19 @@ class TdopParserTest(unittest.TestCase):
         token = self.parser.parse('10 + 6')
         self.assertEqual(token.evaluate(), 16)
 
+    def test_parse_cached(self):
+        parser = type(self.parser)()
+        token = parser.parse_cached('10 + 6')
+        self.assertEqual(token.evaluate(), 16)
+        self.assertIs(parser.parse_cached('10 + 6'), token)
+        self.assertIsNot(parser.parse('10 + 6'), token)
+        self.assertIsNot(parser.parse_cached('10 - 6'), token)
+
+        parser.parse_cache_maxsize = 2
+        parser.parse_cached('1 + 1')
+        self.assertIsNot(parser.parse_cached('10 + 6'), token)
+        self.assertEqual(len(parser._parse_cache), 2)
+
     def test_iter_method(self):
         token = self.parser.parse('9 + 7 - 5')
 
@@ -174,6 +236,33 @@ class TdopParserTest(unittest.TestCase):
             self.parser.parse('5 5')  # with expected()
         self.assertEqual(str(ec.exception), "unexpected literal 5")
 
+    def test_token_sequence_interface(self):
+        token = self.parser.parse('9 + 7')
+        self.assertIsInstance(token, MutableSequence)
+        self.assertIs(type(type(token)), type)
+
+        self.assertEqual(len(token), 2)
+        self.assertListEqual([tk.value for tk in token], [9, 7])
+        self.assertListEqual([tk.value for tk in reversed(token)], [7, 9])
+        self.assertIn(token[1], token)
+        self.assertEqual(token.index(token[1]), 1)
+        self.assertEqual(token.count(token[0]), 1)
+
+        token.append(token.pop(0))
+        self.assertListEqual([tk.value for tk in token], [7, 9])
+        token.reverse()
+        self.assertListEqual([tk.value for tk in token], [9, 7])
+        token.remove(token[0])
+        self.assertEqual(len(token), 1)
+
+        items = token
+        token += [token[0]]
+        self.assertIs(token, items)
+        self.assertEqual(len(token), 2)
+
+        token.clear()
+        self.assertEqual(len(token), 0)
+
     def test_unused_token_helpers(self):
         token = self.parser.parse('10')
         self.assertIsNone(token.unexpected('+', '-'))
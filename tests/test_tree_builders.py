@@ -90,6 +90,18 @@ class TreeBuildersTest(unittest.TestCase):
         self.assertIsInstance(node[0].children[5], ElementNode)
         self.assertIsInstance(node[0].children[6], TextNode)
 
+    def test_node_positions_in_document_order(self):
+        root = ElementTree.XML('<A>text1<B1 a="1"><C1>text2</C1>tail1</B1>tail2<B2/></A>')
+        node = build_node_tree(root)
+        positions = [x.position for x in node.iter_descendants()]
+        self.assertListEqual(positions, sorted(positions))
+
+        if lxml_etree is not None:
+            root = lxml_etree.XML('<A>text1<B1 a="1"><C1>text2</C1>tail1</B1>tail2<B2/></A>')
+            node = build_lxml_node_tree(root)
+            positions = [x.position for x in node.iter_descendants()]
+            self.assertListEqual(positions, sorted(positions))
+
     @unittest.skipIf(sys.version_info <= (3, 8),
                      "Comments not available in ElementTree")
     def test_build_node_tree_with_comments_and_pis(self):
@@ -1267,6 +1267,18 @@ class XPath2ParserTest(test_xpath1_parser.XPath1ParserTest):
         self.check_selector('//@*/local-name()', root, result)
         self.check_selector('//@*/name()', root, result)
 
+    def test_parse_cached_after_external_function(self):
+        parser = self.parser.__class__()
+
+        def foo(x):
+            return str(x)
+
+        parser.external_function(foo)
+        token = parser.parse_cached('foo(8)')
+        self.assertEqual(token.evaluate(), '8')
+        self.assertIs(parser.parse_cached('foo(8)'), token)
+        self.assertEqual(len(parser._parse_cache), 1)
+
     def test_external_function_registration(self):
         parser = self.parser.__class__()
 
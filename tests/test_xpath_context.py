@@ -21,7 +21,7 @@ except ImportError:
     lxml_html = None
 
 from elementpath import XPathContext, DocumentNode, ElementNode, datatypes, \
-    select, get_node_tree, TextNode
+    select, get_node_tree, build_schema_node_tree, TextNode
 
 
 class DummyXsdType:
@@ -40,6 +40,20 @@ class DummyXsdType:
     def validate(self, obj, *args, **kwargs): pass
 
 
+class DummyXsdElement:
+    type = None
+
+    def __init__(self, name, children=(), ref=None):
+        self.name = name
+        self.ref = ref
+        self.namespaces = {}
+        self.attrib = {}
+        self.children = list(children)
+
+    def __iter__(self):
+        return iter(self.children)
+
+
 class XPathContextTest(unittest.TestCase):
     root = ElementTree.XML('<author>Dickens</author>')
 
@@ -186,6 +200,23 @@ class XPathContextTest(unittest.TestCase):
         context.axis = 'attribute'
         self.assertTrue(context.is_principal_node_kind())
 
+    def test_get_root(self):
+        root = ElementTree.XML('<A a1="10"><B1><C1/></B1><B2/></A>')
+        doc = ElementTree.ElementTree(ElementTree.XML('<X><Y/></X>'))
+        context = XPathContext(root, documents={'doc.xml': doc})
+
+        self.assertIs(context.get_root(context.root), context.root)
+        self.assertIs(context.get_root(context.root[0][0]), context.root)
+        self.assertIs(context.get_root(context.root.attributes[0]), context.root)
+
+        doc_node = context.documents['doc.xml']
+        self.assertIs(context.get_root(doc_node), doc_node)
+        self.assertIs(context.get_root(doc_node[0][0]), doc_node)
+
+        other = XPathContext(ElementTree.XML('<A/>'))
+        self.assertIsNone(context.get_root(other.root))
+        self.assertIsNone(context.get_root(root))
+
     def test_iter_product(self):
         context = XPathContext(self.root)
 
@@ -308,6 +339,13 @@ class XPathContextTest(unittest.TestCase):
                 list(e.elem for e in context.iter_siblings('preceding-sibling')), list(root[:2])
             )
 
+        root = ElementTree.XML('<A><B1/><B2 a="1"><C1/></B2><B3/></A>')
+        context = XPathContext(root)
+        context.item = context.root[1].attributes[0]
+        self.assertListEqual(list(context.iter_siblings()), [])
+        self.assertListEqual(list(context.iter_siblings('preceding-sibling')), [])
+        self.assertIs(context.item, context.root[1].attributes[0])
+
     @unittest.skipIf(lxml_etree is None, 'lxml library is not installed')
     def test_iter_siblings__issue_44(self):
         root = lxml_etree.XML('<root>text 1<!-- comment -->text 2<!-- comment --> text 3</root>')
@@ -391,6 +429,24 @@ class XPathContextTest(unittest.TestCase):
         self.assertListEqual(list(e.elem for e in context.iter_preceding()),
                              [root[0], root[0][0], root[1], root[2][0]])
 
+        root = ElementTree.XML('<A><B1/><B2 a="1"><C1/></B2><B3/></A>')
+        context = XPathContext(root)
+        context.item = context.root[1].attributes[0]
+        self.assertListEqual(list(e.elem for e in context.iter_preceding()), [root[0]])
+        self.assertIs(context.item, context.root[1].attributes[0])
+
+        # Schema trees: sibling subtrees can share a global element by reference
+        elem = DummyXsdElement('g', [DummyXsdElement('h')])
+        schema_elem = DummyXsdElement('top', [
+            DummyXsdElement('a', [DummyXsdElement('g', ref=elem)]),
+            DummyXsdElement('c', [DummyXsdElement('g', ref=elem)]),
+            DummyXsdElement('d'),
+        ])
+        root_node = build_schema_node_tree(schema_elem, global_elements=[])
+        context = XPathContext(root_node, item=root_node.children[2])
+        self.assertListEqual([e.elem.name for e in context.iter_preceding()],
+                             ['a', 'g', 'h', 'c'])
+
     def test_iter_following(self):
         root = ElementTree.XML('<A a="1"><B1><C1/></B1><B2/><B3><C1/></B3><B4/><B5/></A>')
 
@@ -413,6 +469,23 @@ class XPathContextTest(unittest.TestCase):
             context.root[1].xsd_type = xsd_type
             self.assertListEqual(list(e.elem for e in context.iter_followings()), result)
 
+        root = ElementTree.XML('<A><B1><C1/></B1>tail1<B2/>tail2</A>')
+        context = XPathContext(root, item=root[0][0])
+        result = [x.value for x in context.iter_followings()]
+        self.assertListEqual(result, ['tail1', root[1], 'tail2'])
+
+        # Schema trees: a local element shared by two parents
+        elem = DummyXsdElement('x', [DummyXsdElement('y')])
+        schema_elem = DummyXsdElement('r', [
+            DummyXsdElement('a', [elem]), DummyXsdElement('b', [elem])
+        ])
+        root_node = build_schema_node_tree(schema_elem)
+        context = XPathContext(root_node, item=root_node.children[1].children[0])
+        self.assertListEqual(list(context.iter_followings()), [])
+
+        context = XPathContext(root_node, item=root_node.children[0])
+        self.assertListEqual([e.elem.name for e in context.iter_followings()], ['b', 'x'])
+
 
 if __name__ == '__main__':
     unittest.main()
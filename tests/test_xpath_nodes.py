@@ -334,6 +334,7 @@ class XPathNodesTest(unittest.TestCase):
         self.assertEqual(context.root[2].path, '/A/B3')
         self.assertEqual(context.root[2][0].path, '/A/B3/C1')
         self.assertEqual(context.root[2][1].path, '/A/B3/C2')
+        self.assertIs(context.root[2][1].path, context.root[2][1].path)
 
         attr = context.root[2][1].attributes[0]
         self.assertEqual(attr.path, '/A/B3/C2/@max')
@@ -74,6 +74,8 @@ class XPath1TokenTest(unittest.TestCase):
         self.assertEqual(ordinal(11), '11th')
         self.assertEqual(ordinal(23), '23rd')
         self.assertEqual(ordinal(34), '34th')
+        self.assertEqual(ordinal(111), '111th')
+        self.assertEqual(ordinal(122), '122nd')
 
     def test_arity_property(self):
         token = self.parser.parse('true()')
@@ -137,6 +139,9 @@ class XPath1TokenTest(unittest.TestCase):
         self.assertEqual(token.tree, '(/ (/ (A)) ([ (B) (C)))')
         self.assertListEqual(list(token.iter_leaf_elements()), ['B'])
 
+        token = self.parser.parse('A | B/C | D[E]')
+        self.assertListEqual(list(token.iter_leaf_elements()), ['A', 'C', 'D'])
+
     def test_get_argument_method(self):
         token = self.parser.symbol_table['true'](self.parser)
 
@@ -298,6 +303,8 @@ class XPath1TokenTest(unittest.TestCase):
         self.assertEqual(token.string_value(10), '10')
         self.assertEqual(token.string_value(1e99), '1E99')
         self.assertEqual(token.string_value(1e-05), '1E-05')
+        self.assertEqual(token.string_value(-2.5e300), '-2.5E300')
+        self.assertEqual(token.string_value(1.5e-100), '1.5E-100')
         self.assertEqual(token.string_value(1.00), '1')
         self.assertEqual(token.string_value(+19.0010), '19.001')
 